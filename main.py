@@ -6,114 +6,217 @@
 
 
 import sqlite3
+import sys
 import matplotlib.pyplot as plt
-from datetime import datetime
 import math
+import numpy as np
+
+# SQL for the queries run on every menu invocation, kept as module constants so the text is identical each time
+# and always hits the connection's prepared-statement cache
+FIND_STATIONS_SQL = "SELECT Station_ID, Station_Name FROM Stations WHERE Station_Name LIKE ? ORDER BY Station_Name"
+STATION_LOOKUP_SQL = "SELECT Station_ID, Station_Name FROM Stations WHERE Station_Name LIKE ?"
+STATION_ID_SQL = "SELECT Station_ID FROM Stations WHERE Station_Name = ?"
+RIDERSHIP_BY_DAY_TYPE_SQL = """
+SELECT SUM(CASE WHEN Type_of_Day = 'W' THEN Num_Riders END),
+       SUM(CASE WHEN Type_of_Day = 'A' THEN Num_Riders END),
+       SUM(CASE WHEN Type_of_Day = 'U' THEN Num_Riders END),
+       SUM(Num_Riders)
+FROM Ridership
+WHERE Station_ID = ?
+"""
+YEARLY_RIDERSHIP_SQL = """
+SELECT Year, SUM(Num_Riders) as Total_Riders
+FROM Ridership
+WHERE Station_ID = ?
+GROUP BY Year
+ORDER BY Year
+"""
+MONTHLY_RIDERSHIP_SQL = """
+SELECT Month, SUM(Num_Riders) as Total_Riders
+FROM Ridership
+WHERE Station_ID = ? AND Year = ?
+GROUP BY Month
+ORDER BY Month
+"""
+DAILY_RIDERSHIP_SQL = """
+SELECT substr(Ride_Date, 1, 10) as Date, SUM(Num_Riders) as Total_Riders
+FROM Ridership WHERE Station_ID = ? AND Year = ?
+GROUP BY Date ORDER BY Date
+"""
+
+# Pre-bound row formatters for the multi-row listings, so each format spec is parsed once rather than per row
+_fmt_station = "{} : {}\n".format
+_fmt_weekday = "{} : {:,} ({:.2f}%)\n".format
+_fmt_color_direction = "{} going {} : {} ({:.2f}%)\n".format
+
+# Rows fetched per round-trip from the SQLite VM by iter_rows
+FETCH_BATCH_SIZE = 1024
+
+# Yields a cursor's remaining rows, fetched from SQLite in batches of dbCursor.arraysize
+def iter_rows(dbCursor):
+    while True:
+        rows = dbCursor.fetchmany()
+        if not rows:
+            break
+        yield from rows
+
+# Raised when a station pattern matches no station, or more than one
+class StationLookupError(Exception):
+    pass
+
+# Above this many nearby stations the map is drawn without name labels
+MAX_MAP_LABELS = 50
+
+# Decoded chicago.png, loaded on first use
+_CHICAGO_MAP = None
+
+# Returns the Chicago map image, reading and decoding the PNG only once per session
+def _get_map():
+    global _CHICAGO_MAP
+    if _CHICAGO_MAP is None:
+        _CHICAGO_MAP = plt.imread("chicago.png")
+    return _CHICAGO_MAP
+
+# Station lookups by LIKE pattern, memoized for the session
+_station_cache: dict[str, list[tuple[int, str]]] = {}
+
+# Returns the (Station_ID, Station_Name) pairs matching a LIKE pattern, querying the database only on a cache miss
+def resolve_stations(dbConn, pattern):
+    if pattern not in _station_cache:
+        dbCursor = dbConn.cursor()
+        dbCursor.execute(STATION_LOOKUP_SQL, (pattern,))
+        _station_cache[pattern] = dbCursor.fetchall()
+    return _station_cache[pattern]
+
+# Downsamples a series to at most n_out points with Largest-Triangle-Three-Buckets, keeping its visual shape for plotting
+def lttb(x, y, n_out=2000):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    xf = np.asarray(x, dtype=float)
+    yf = np.asarray(y, dtype=float)
+    # The first and last points are always kept; the points in between are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    edges = np.append(edges, n)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (just the last point when this is the final bucket)
+        avg_x = xf[end:edges[i + 2]].mean()
+        avg_y = yf[end:edges[i + 2]].mean()
+        # Keep the point forming the largest triangle with the previously kept point and the next bucket's average
+        areas = np.abs((xf[a] - avg_x) * (yf[start:end] - yf[a]) - (xf[a] - xf[start:end]) * (avg_y - yf[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+    return np.asarray(x)[selected], np.asarray(y)[selected]
+
+# Returns a boolean mask of the points lying within max_mi miles (great-circle distance) of (lat0, lon0)
+def haversine_filter(lats, lons, lat0, lon0, max_mi):
+    lat1, lon1 = np.radians(lats), np.radians(lons)
+    lat0, lon0 = math.radians(lat0), math.radians(lon0)
+    a = np.sin((lat1 - lat0) / 2) ** 2 + math.cos(lat0) * np.cos(lat1) * np.sin((lon1 - lon0) / 2) ** 2
+    return 2 * 3958.8 * np.arcsin(np.sqrt(a)) <= max_mi  # Earth's mean radius in miles
 
 # Prints general statistics about the CTA L ridership database
 def print_stats(dbConn):
     dbCursor = dbConn.cursor()
-    stats_queries = [
-        ("Select count(*) From Stations;", "  # of stations:"),
-        ("Select count(*) From Stops;", "  # of stops:"),
-        ("Select count(*) From Ridership;", "  # of ride entries:"),
-        ("Select min(Ride_Date), max(Ride_Date) From Ridership;", "  date range:"),
-        ("Select sum(Num_Riders) From Ridership;", "  Total ridership:")
-    ]
-    
+    # Single round-trip: Ridership count, date range and sum are computed in one scan
+    query = """
+    SELECT (SELECT COUNT(*) FROM Stations), (SELECT COUNT(*) FROM Stops),
+           COUNT(*), MIN(Ride_Date), MAX(Ride_Date), SUM(Num_Riders)
+    FROM Ridership
+    """
+    num_stations, num_stops, num_entries, min_date, max_date, total_ridership = dbCursor.execute(query).fetchone()
+
     print("** Welcome to CTA L analysis app **\n")
     print("General Statistics:")
-    
-    for query, label in stats_queries:
-        dbCursor.execute(query)
-        result = dbCursor.fetchone()
-        if "date range" in label:
-            min_date = result[0].split(" ")[0]  # Keep only the date part
-            max_date = result[1].split(" ")[0]  # Keep only the date part
-            print(f"{label} {min_date} - {max_date}")
-        else:
-            print(f"{label} {result[0]:,}")
+    print(f"  # of stations: {num_stations:,}")
+    print(f"  # of stops: {num_stops:,}")
+    print(f"  # of ride entries: {num_entries:,}")
+    print(f"  date range: {min_date.split(' ')[0]} - {max_date.split(' ')[0]}")  # Keep only the date part
+    print(f"  Total ridership: {total_ridership:,}")
 
 # Searches for station names that match a given partial name and prints the matching station IDs and names
 def find_station_names(dbConn, partial_name):
     dbCursor = dbConn.cursor()
-    dbCursor.execute("SELECT Station_ID, Station_Name FROM Stations WHERE Station_Name LIKE ? ORDER BY Station_Name", (partial_name,))
+    dbCursor.execute(FIND_STATIONS_SQL, (partial_name,))
     stations = dbCursor.fetchall()
     if stations:
-        for station_id, station_name in stations:
-            print(f"{station_id} : {station_name}")
+        sys.stdout.write("".join(_fmt_station(station_id, station_name) for station_id, station_name in stations))
     else:
         print("**No stations found...")
 
 # Calculates and prints the percentage of ridership for a specific station by type of day
 def ridership_percentages(dbConn, station_name):
     dbCursor = dbConn.cursor()
-    query = """
-    SELECT Type_of_Day, SUM(Num_Riders)
-    FROM Ridership
-    JOIN Stations ON Ridership.Station_ID = Stations.Station_ID
-    WHERE Station_Name = ?
-    GROUP BY Type_of_Day
-    ORDER BY CASE WHEN Type_of_Day = 'W' THEN 1 WHEN Type_of_Day = 'A' THEN 2 ELSE 3 END
-    """
-    dbCursor.execute(query, (station_name,))
-    results = dbCursor.fetchall()
+    # Resolve the station once, then filter Ridership by its ID instead of joining on the name
+    dbCursor.execute(STATION_ID_SQL, (station_name,))
+    station = dbCursor.fetchone()
+    weekday = saturday = sunday = total_ridership = None
+    if station:
+        # One aggregate row: the per-type sums (None when a type has no entries) and the overall total
+        dbCursor.execute(RIDERSHIP_BY_DAY_TYPE_SQL, (station[0],))
+        weekday, saturday, sunday, total_ridership = dbCursor.fetchone()
     
-    if results:
-        total_ridership = sum(count for _, count in results)
-        print(f"Percentage of ridership for the {station_name} station:")
-        for type_of_day, count in results:
-            day_string = "Weekday" if type_of_day == 'W' else "Saturday" if type_of_day == 'A' else "Sunday/holiday"
-            print(f"  {day_string} ridership: {count:,} ({(count / total_ridership) * 100:.2f}%)")
-        print(f"  Total ridership: {total_ridership:,}")
+    if total_ridership is not None:
+        lines = [f"Percentage of ridership for the {station_name} station:"]
+        for day_string, count in (("Weekday", weekday), ("Saturday", saturday), ("Sunday/holiday", sunday)):
+            if count is not None:
+                lines.append(f"  {day_string} ridership: {count:,} ({(count / total_ridership) * 100:.2f}%)")
+        lines.append(f"  Total ridership: {total_ridership:,}")
+        sys.stdout.write("\n".join(lines) + "\n")
     else:
         print("**No data found...")
 
 # Computes and displays the total number of riders for weekdays for each station, along with the percentage of the total weekday ridership each station represents
 def total_weekday_ridership(dbConn):
     dbCursor = dbConn.cursor()
-    # Fetch the total number of riders for weekdays for each station
+    dbCursor.arraysize = FETCH_BATCH_SIZE
+    # Fetch the total number of riders for weekdays for each station, along with its share of the overall weekday total
     query = """
-    SELECT Station_Name, SUM(Num_Riders) as Total_Riders
+    SELECT Station_Name, SUM(Num_Riders) AS Total_Riders,
+           100.0 * SUM(Num_Riders) / SUM(SUM(Num_Riders)) OVER () AS Percentage
     FROM Ridership
-    JOIN Stations ON Ridership.Station_ID = Stations.Station_ID
+    JOIN Stations USING (Station_ID)
     WHERE Type_of_Day = 'W'
     GROUP BY Stations.Station_ID
     ORDER BY Total_Riders DESC
     """
     dbCursor.execute(query)
-    results = dbCursor.fetchall()
-    
-    # Calculate the total ridership on weekdays for all stations
-    total_ridership = sum([count for _, count in results])
     
     print("Ridership on Weekdays for Each Station")
-    for station_name, count in results:
-        percentage = (count / total_ridership) * 100
-        print(f"{station_name} : {count:,} ({percentage:.2f}%)")
+    sys.stdout.write("".join(_fmt_weekday(*row) for row in iter_rows(dbCursor)))
+
+# Loads the directions each line color runs in, keyed by color, so line and direction input can be validated without a query
+def load_line_directions(dbConn):
+    dbCursor = dbConn.cursor()
+    dbCursor.execute("""
+    SELECT DISTINCT Color, Direction FROM Lines
+    LEFT JOIN StopDetails ON Lines.Line_ID = StopDetails.Line_ID
+    LEFT JOIN Stops ON StopDetails.Stop_ID = Stops.Stop_ID
+    """)
+    line_dirs: dict[str, set[str]] = {}
+    for color, direction in dbCursor.fetchall():
+        directions = line_dirs.setdefault(color, set())
+        if direction is not None:
+            directions.add(direction)
+    return line_dirs
 
 # Lists all stops for a specific line color in a given direction, indicating whether each stop is handicap accessible
-def list_stops_by_line_and_direction(dbConn, line_color):
+def list_stops_by_line_and_direction(dbConn, line_color, line_dirs):
     dbCursor = dbConn.cursor()
+    dbCursor.arraysize = FETCH_BATCH_SIZE
     line_color = line_color.title()
 
-    dbCursor.execute("SELECT Line_ID FROM Lines WHERE Color = ?", (line_color,))
-    line_exists = dbCursor.fetchone()
-    if not line_exists:
+    if line_color not in line_dirs:
         print("**No such line...")
         return
 
     direction = input("Enter a direction (N/S/W/E): ").upper()
 
-    dbCursor.execute("""
-    SELECT DISTINCT Direction FROM Stops
-    JOIN StopDetails ON Stops.Stop_ID = StopDetails.Stop_ID
-    JOIN Lines ON StopDetails.Line_ID = Lines.Line_ID
-    WHERE Color = ?
-    """, (line_color,))
-    valid_directions = {row[0] for row in dbCursor.fetchall()}
-    
-    if direction not in valid_directions:
+    if direction not in line_dirs[line_color]:
         print("**That line does not run in the direction chosen...")
         return
 
@@ -126,11 +229,12 @@ def list_stops_by_line_and_direction(dbConn, line_color):
     ORDER BY Stop_Name
     """, (line_color, direction))
     
-    results = dbCursor.fetchall()
-    if results:
-        for stop_name, _, ada in results:
-            ada_status = "(handicap accessible)" if ada else "(not handicap accessible)"  # Updated line
-            print(f"{stop_name} : direction = {direction} {ada_status}")
+    lines = []
+    for stop_name, _, ada in iter_rows(dbCursor):
+        ada_status = "(handicap accessible)" if ada else "(not handicap accessible)"  # Updated line
+        lines.append(f"{stop_name} : direction = {direction} {ada_status}\n")
+    if lines:
+        sys.stdout.write("".join(lines))
     else:
         print("No stops found for this line and direction.")
 
@@ -154,16 +258,13 @@ def stops_for_each_color_by_direction(dbConn):
     results = dbCursor.fetchall()
     
     print("Number of Stops For Each Color By Direction")
-    for color, direction, num_stops in results:
-        percentage = (num_stops / total_stops) * 100
-        print(f"{color} going {direction} : {num_stops} ({percentage:.2f}%)")
+    sys.stdout.write("".join(_fmt_color_direction(color, direction, num_stops, (num_stops / total_stops) * 100) for color, direction, num_stops in results))
 
 # Displays the total ridership for each year at a specified station, with an option for the user to plot this data
 def yearly_ridership(dbConn, station_name):
     dbCursor = dbConn.cursor()
     # Check for exact or multiple station matches
-    dbCursor.execute("SELECT DISTINCT Station_Name FROM Stations WHERE Station_Name LIKE ?", (station_name,))
-    matching_stations = dbCursor.fetchall()
+    matching_stations = resolve_stations(dbConn, station_name)
     if len(matching_stations) == 0:
         print("**No station found...")
         return
@@ -172,29 +273,21 @@ def yearly_ridership(dbConn, station_name):
         return
 
     # Fetch the total ridership for each year
-    query = """
-    SELECT strftime('%Y', Ride_Date) as Year, SUM(Num_Riders) as Total_Riders
-    FROM Ridership
-    JOIN Stations ON Ridership.Station_ID = Stations.Station_ID
-    WHERE Station_Name = ?
-    GROUP BY Year
-    ORDER BY Year
-    """
-    dbCursor.execute(query, (matching_stations[0][0],))
+    dbCursor.execute(YEARLY_RIDERSHIP_SQL, (matching_stations[0][0],))
     results = dbCursor.fetchall()
 
-    print(f"Yearly Ridership at {matching_stations[0][0]}")
+    print(f"Yearly Ridership at {matching_stations[0][1]}")
     for year, total_riders in results:
         print(f"{year} : {total_riders:,}")
 
     # Ask user if they want to plot the data
     plot_input = input("\nPlot? (y/n) ")
     if plot_input.lower() == 'y':
-        years = [row[0] for row in results]
-        ridership = [row[1] for row in results]
+        years = np.asarray([str(row[0]) for row in results])
+        ridership = np.fromiter((row[1] for row in results), dtype=np.int64, count=len(results))
         plt.figure(figsize=(10, 5))
         plt.plot(years, ridership)
-        plt.title(f"Yearly Ridership at {matching_stations[0][0]} Station")
+        plt.title(f"Yearly Ridership at {matching_stations[0][1]} Station")
         plt.xlabel("Year")
         plt.ylabel("Number of Riders")
         plt.tight_layout()
@@ -204,8 +297,7 @@ def yearly_ridership(dbConn, station_name):
 def monthly_ridership(dbConn, station_name):
     dbCursor = dbConn.cursor()
     # Check for exact or multiple station matches
-    dbCursor.execute("SELECT DISTINCT Station_Name FROM Stations WHERE Station_Name LIKE ?", (station_name,))
-    matching_stations = dbCursor.fetchall()
+    matching_stations = resolve_stations(dbConn, station_name)
     if len(matching_stations) == 0:
         print("**No station found...")
         return
@@ -216,29 +308,21 @@ def monthly_ridership(dbConn, station_name):
     year = input("Enter a year: ")
 
     # Fetch the total ridership for each month
-    query = """
-    SELECT strftime('%m', Ride_Date) as Month, SUM(Num_Riders) as Total_Riders
-    FROM Ridership
-    JOIN Stations ON Ridership.Station_ID = Stations.Station_ID
-    WHERE Station_Name = ? AND strftime('%Y', Ride_Date) = ?
-    GROUP BY Month
-    ORDER BY Month
-    """
-    dbCursor.execute(query, (matching_stations[0][0], year))
+    dbCursor.execute(MONTHLY_RIDERSHIP_SQL, (matching_stations[0][0], year))
     results = dbCursor.fetchall()
 
-    print(f"Monthly Ridership at {matching_stations[0][0]} for {year}")
+    print(f"Monthly Ridership at {matching_stations[0][1]} for {year}")
     for month, total_riders in results:
-        print(f"{month}/{year} : {total_riders:,}")
+        print(f"{month:02d}/{year} : {total_riders:,}")
 
     # Ask user if they want to plot the data
     plot_input = input("\nPlot? (y/n) ")
     if plot_input.lower() == 'y':
-        months = [row[0] for row in results]
-        ridership = [row[1] for row in results]
+        months = np.asarray([f"{row[0]:02d}" for row in results])
+        ridership = np.fromiter((row[1] for row in results), dtype=np.int64, count=len(results))
         plt.figure(figsize=(10, 5))
         plt.plot(months, ridership)
-        plt.title(f"Monthly Ridership at {matching_stations[0][0]} Station ({year})")
+        plt.title(f"Monthly Ridership at {matching_stations[0][1]} Station ({year})")
         plt.xlabel("Month")
         plt.ylabel("Number of Riders")
         plt.tight_layout()
@@ -249,63 +333,58 @@ def daily_ridership_comparison(dbConn, year):
     dbCursor = dbConn.cursor()
 
     def fetch_daily_ridership(station_name):
-        nonlocal flag
-        dbCursor.execute("SELECT Station_ID, Station_Name FROM Stations WHERE Station_Name LIKE ?", ('%' + station_name + '%',))
-        matching_stations = dbCursor.fetchall()
+        matching_stations = resolve_stations(dbConn, '%' + station_name + '%')
         if len(matching_stations) == 0:
-            print("**No station found...")
-            flag = 1
-            return None, None, None
+            raise StationLookupError("**No station found...")
         elif len(matching_stations) > 1:
-            print("**Multiple stations found...")
-            flag = 1
-            return None, None, None
+            raise StationLookupError("**Multiple stations found...")
         station_id, exact_station_name = matching_stations[0]
 
-        dbCursor.execute("""
-            SELECT strftime('%Y-%m-%d', Ride_Date) as Date, SUM(Num_Riders) as Total_Riders
-            FROM Ridership WHERE Station_ID = ? AND strftime('%Y', Ride_Date) = ?
-            GROUP BY Date ORDER BY Date
-        """, (station_id, year))
-        return station_id, exact_station_name, dbCursor.fetchall()
+        dbCursor.execute(DAILY_RIDERSHIP_SQL, (station_id, year))
+        # Read the cursor once straight into typed arrays instead of building a list of tuples
+        data = np.fromiter(dbCursor, dtype=[('date', 'datetime64[D]'), ('riders', np.int64)])
+        return station_id, exact_station_name, data
 
-    flag = 0
     station1 = input("\nEnter station 1 (wildcards _ and %): ")
-    station1_id, station1_name, station1_data = fetch_daily_ridership(station1)
-    if flag == 1: return
+    try:
+        station1_id, station1_name, station1_data = fetch_daily_ridership(station1)
+    except StationLookupError as e:
+        print(e)
+        return
 
-    flag = 0
     station2 = input("\nEnter station 2 (wildcards _ and %): ")
-    station2_id, station2_name, station2_data = fetch_daily_ridership(station2)
-    if flag == 1: return
+    try:
+        station2_id, station2_name, station2_data = fetch_daily_ridership(station2)
+    except StationLookupError as e:
+        print(e)
+        return
 
     print(f"Station 1: {station1_id} {station1_name}")
-    for date, riders in station1_data[:5] + station1_data[-5:]:
+    for date, riders in np.concatenate((station1_data[:5], station1_data[-5:])):
         print(f"{date} {riders}")
 
     print(f"Station 2: {station2_id} {station2_name}")
-    for date, riders in station2_data[:5] + station2_data[-5:]:
+    for date, riders in np.concatenate((station2_data[:5], station2_data[-5:])):
         print(f"{date} {riders}")
 
     plot_input = input("\nPlot? (y/n) ")
     if plot_input.lower() == 'y':
-        # Convert date strings to datetime objects
-        dates = [datetime.strptime(row[0], '%Y-%m-%d') for row in station1_data]
-        # Convert datetime objects to day of year
-        days = [(date - datetime(date.year, 1, 1)).days + 1 for date in dates]
+        # Convert dates to day of year (SQLite's ISO-8601 dates were parsed into datetime64 by NumPy when fetched)
+        dates = station1_data['date']
+        days = (dates - dates.astype('datetime64[Y]')).astype('int32') + 1
 
-        ridership1 = [row[1] for row in station1_data]
-        ridership2 = [row[1] for row in station2_data]
+        ridership1 = station1_data['riders']
+        ridership2 = station2_data['riders']
 
         plt.figure(figsize=(10, 5))
-        plt.plot(days, ridership1, label=f"{station1_name}")
-        plt.plot(days, ridership2, label=f"{station2_name}")  
+        plt.plot(*lttb(days, ridership1), label=f"{station1_name}")
+        plt.plot(*lttb(days, ridership2), label=f"{station2_name}")  
 
         plt.title(f"Ridership Each Day of {year}")
         plt.xlabel("Day")
         plt.ylabel("Number of Riders")
 
-        plt.xticks(range(0, max(days) + 1, 50))  # Set x-axis ticks at intervals of 50
+        plt.xticks(range(0, days.max() + 1, 50))  # Set x-axis ticks at intervals of 50
         plt.legend()
         plt.tight_layout()
         plt.show()
@@ -345,27 +424,34 @@ def stations_within_mile(dbConn, latitude):
     FROM Stops
     JOIN Stations ON Stops.Station_ID = Stations.Station_ID
     WHERE Stops.Latitude BETWEEN ? AND ? AND Stops.Longitude BETWEEN ? AND ?
+    ORDER BY Stations.Station_Name
     """
     dbCursor.execute(query, (lat_lower, lat_upper, lon_left, lon_right))
 
     results = dbCursor.fetchall()
 
-    # Sorting results by station name and rounding coordinates to three decimal places
-    sorted_results = sorted(results, key=lambda x: x[0])
+    # The bounding box over-approximates a one mile radius, so drop the stops lying in its corners
+    lats = np.fromiter((lat for _, lat, _ in results), dtype=float, count=len(results))
+    lons = np.fromiter((lon for _, _, lon in results), dtype=float, count=len(results))
+    within_mile = haversine_filter(lats, lons, latitude, longitude, 1)
+    results = [row for row, keep in zip(results, within_mile) if keep]
+    lats, lons = lats[within_mile], lons[within_mile]
 
-    if sorted_results:
+    if results:
         print("\nList of Stations Within a Mile")
-        for station_name, lat, lon in sorted_results:
+        for station_name, lat, lon in results:
             print(f"{station_name} : ({lat}, {lon})")
         plot_input = input("\nPlot? (y/n) ")
         if plot_input.lower() == 'y':
             # Plot the stations on the provided Chicago map
-            image = plt.imread("chicago.png")
+            image = _get_map()
             xydims = [-87.9277, -87.5569, 41.7012, 42.0868]  # Map boundaries
             plt.imshow(image, extent=xydims)
-            plt.scatter([lon for _, _, lon in results], [lat for _, lat, _ in results], marker='o', color='blue')
-            for station_name, lat, lon in results:
-                plt.annotate(station_name, (lon, lat))
+            plt.scatter(lons, lats, marker='o', color='blue')
+            # Label each station with a plain clipped Text artist, skipping labels entirely when the map would be too crowded
+            if len(results) <= MAX_MAP_LABELS:
+                for station_name, lat, lon in results:
+                    plt.text(lon, lat, station_name, clip_on=True)
             plt.title("Stations Near You")
             plt.xlim([-87.9277, -87.5569])
             plt.ylim([41.7012, 42.0868])
@@ -373,8 +459,47 @@ def stations_within_mile(dbConn, latitude):
     else:
         print("**No stations found...")
 
+# Tunes the connection for a read-heavy session: WAL journal, large page cache and memory-mapped I/O
+def set_pragmas(dbConn):
+    dbCursor = dbConn.cursor()
+    dbCursor.execute("PRAGMA journal_mode = WAL")
+    dbCursor.execute("PRAGMA synchronous = NORMAL")
+    dbCursor.execute("PRAGMA cache_size = -262144")  # 256 MB
+    dbCursor.execute("PRAGMA mmap_size = 268435456")  # 256 MB
+    dbCursor.execute("PRAGMA temp_store = MEMORY")
+    dbCursor.execute("PRAGMA case_sensitive_like = OFF")  # Required for LIKE to use the NOCASE station name index
+
+# Adds integer Year/Month columns to Ridership (once) so queries can filter and group without parsing Ride_Date
+def add_date_columns(dbConn):
+    dbCursor = dbConn.cursor()
+    columns = {row[1] for row in dbCursor.execute("PRAGMA table_info(Ridership)")}
+    if "Year" in columns and "Month" in columns:
+        return
+    dbCursor.execute("ALTER TABLE Ridership ADD COLUMN Year INTEGER")
+    dbCursor.execute("ALTER TABLE Ridership ADD COLUMN Month INTEGER")
+    dbCursor.execute("UPDATE Ridership SET Year = CAST(substr(Ride_Date, 1, 4) AS INT), Month = CAST(substr(Ride_Date, 6, 2) AS INT)")
+    dbConn.commit()
+
+# Creates covering indexes on Ridership so the per-station aggregates are answered from the index alone,
+# plus a Stops(Latitude, Longitude) index for the bounding-box search and a NOCASE Station_Name index that
+# SQLite's LIKE optimization can range-scan when the pattern does not start with a wildcard
+def create_indexes(dbConn):
+    dbCursor = dbConn.cursor()
+    dbCursor.execute("CREATE INDEX IF NOT EXISTS idx_rid_station_date ON Ridership(Station_ID, Ride_Date, Num_Riders)")
+    dbCursor.execute("CREATE INDEX IF NOT EXISTS idx_rid_tod_station ON Ridership(Type_of_Day, Station_ID, Num_Riders)")
+    dbCursor.execute("CREATE INDEX IF NOT EXISTS idx_rid_station_year_month ON Ridership(Station_ID, Year, Month, Num_Riders)")
+    dbCursor.execute("CREATE INDEX IF NOT EXISTS idx_stops_latlon ON Stops(Latitude, Longitude)")
+    dbCursor.execute("CREATE INDEX IF NOT EXISTS idx_stations_name_nocase ON Stations(Station_Name COLLATE NOCASE)")
+    dbCursor.execute("ANALYZE")
+    dbConn.commit()
+
 def main():
-    dbConn = sqlite3.connect('CTA2_L_daily_ridership.db')
+    dbConn = sqlite3.connect('CTA2_L_daily_ridership.db', cached_statements=256)
+    set_pragmas(dbConn)
+    add_date_columns(dbConn)
+    create_indexes(dbConn)
+    dbConn.execute("PRAGMA query_only = 1")  # Schema setup is done, the rest of the session only reads
+    line_dirs = load_line_directions(dbConn)
     print_stats(dbConn)
     
     # User command loop
@@ -383,7 +508,7 @@ def main():
         if command.lower() == "x":
             break
         elif command == "1":
-            partial_station_name = input("\nEnter partial station name (wildcards _ and %): ")
+            partial_station_name = input("\nEnter partial station name (wildcards _ and %, prefix wildcards slower): ")
             find_station_names(dbConn, partial_station_name)
         elif command == "2":
             station_name = input("\nEnter the name of the station you would like to analyze: ")
@@ -392,14 +517,14 @@ def main():
             total_weekday_ridership(dbConn)
         elif command == "4":
             line_color = input("\nEnter a line color (e.g. Red or Yellow): ").strip().title()
-            list_stops_by_line_and_direction(dbConn, line_color)
+            list_stops_by_line_and_direction(dbConn, line_color, line_dirs)
         elif command == "5":
             stops_for_each_color_by_direction(dbConn)
         elif command == "6":
-            station_name = input("\nEnter a station name (wildcards _ and %): ")
+            station_name = input("\nEnter a station name (wildcards _ and %, prefix wildcards slower): ")
             yearly_ridership(dbConn, station_name)
         elif command == "7":
-            station_name = input("\nEnter a station name (wildcards _ and %): ")
+            station_name = input("\nEnter a station name (wildcards _ and %, prefix wildcards slower): ")
             monthly_ridership(dbConn, station_name)
         elif command == "8":
             year = input("\nYear to compare against? ")